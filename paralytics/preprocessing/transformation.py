@@ -1,6 +1,15 @@
+import numpy as np
 import pandas as pd
 
+from joblib import delayed, Parallel
+from pandas.api.types import CategoricalDtype, is_list_like, is_numeric_dtype
 from sklearn.base import BaseEstimator, TransformerMixin
+try:
+    from numba import njit, prange
+except ImportError as e:
+    _has_numba = e
+else:
+    _has_numba = True
 
 from ..utils import is_numeric
 
@@ -134,7 +143,8 @@ class CategoricalGrouper(BaseEstimator, TransformerMixin):
 
     new_cat: string or int, optional (default='Other')
         Specifies the category name that will be imputed to the chosen sparse
-        observations.
+        observations. If it is already one of the categories, sparse
+        observations are merged into it.
 
     include_cols: list, optional (default=None)
         Specifies column names that should be treated like categorical
@@ -146,6 +156,16 @@ class CategoricalGrouper(BaseEstimator, TransformerMixin):
         categorical features. If None then no column is excluded from
         transformation.
 
+    use_numba: boolean, optional (default=False)
+        Specifies whether category dtype columns should be transformed all at
+        once with the numba compiled kernel, which pays off on wide and long
+        DataFrames. Requires the 'numba' extra.
+
+    n_jobs: int, optional (default=None)
+        The number of threads used to find sparse categories of the columns
+        in parallel while fitting. None means 1 unless in a
+        joblib.parallel_backend context and -1 means using all processors.
+
     Attributes
     ----------
     cat_cols_: list
@@ -157,12 +177,15 @@ class CategoricalGrouper(BaseEstimator, TransformerMixin):
 
     """
     def __init__(self, method='freq', percentile_thresh=.05, new_cat='Other',
-                 include_cols=None, exclude_cols=None):
+                 include_cols=None, exclude_cols=None, use_numba=False,
+                 n_jobs=None):
         self.method = method
         self.percentile_thresh = percentile_thresh
         self.new_cat = new_cat
         self.include_cols = include_cols
         self.exclude_cols = exclude_cols
+        self.use_numba = use_numba
+        self.n_jobs = n_jobs
 
     def fit(self, X, y=None):
         """Fits grouping with X by using given method.
@@ -190,20 +213,29 @@ class CategoricalGrouper(BaseEstimator, TransformerMixin):
 
         self.imp_cats_ = {}
         if self.method == 'freq':
-            for col in self.cat_cols_:
-                tracker, i = 0, 0
-                sorted_series = X[col].value_counts(normalize=True)
-                while tracker < 1 - self.percentile_thresh:
-                    tracker += sorted_series.iloc[i]
-                    i += 1
-                sparse_cats = sorted_series.index[i:].tolist()
-                if len(sparse_cats) > 1:
-                    self.imp_cats_[col] = sparse_cats
-                else:
-                    self.imp_cats_[col] = []
+            sparse_cats = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+                delayed(self._find_sparse_cats)(X[col])
+                for col in self.cat_cols_
+            )
+            self.imp_cats_ = dict(zip(self.cat_cols_, sparse_cats))
 
         return self
 
+    def _find_sparse_cats(self, X):
+        """Returns categories of X outside the percentile threshold."""
+        if X.dtype.name == 'category' and len(X.cat.categories) < 2:
+            return []
+        counts = X.value_counts()
+        cum_counts = np.cumsum(counts.values)
+        n = counts.values.sum()
+        i = np.searchsorted(
+            cum_counts, (1 - self.percentile_thresh) * n, side='left'
+        ) + 1
+        if i < len(counts) - 1:
+            return counts.index[i:].tolist()
+
+        return []
+
     def transform(self, X):
         """Apply grouping of sparse categories on X.
 
@@ -228,47 +260,149 @@ class CategoricalGrouper(BaseEstimator, TransformerMixin):
         assert isinstance(X, pd.DataFrame), \
             'Input must be an instance of pandas.DataFrame()'
 
-        X_new = X.copy()
+        cols_error = pd.Index(self.cat_cols_).difference(X.columns).tolist()
+        if cols_error:
+            raise KeyError(
+                "Fitted columns not found in the DataFrame: %s" % cols_error
+            )
+
+        grouped = self._group_sparse_codes(X) if self.use_numba else {}
+        X_new = X.copy(deep=False)
         for col in self.cat_cols_:
-            row_indices = X_new[col].isin(self.imp_cats_[col])
-            if X_new[col].dtype.name == 'category':
-                try:
-                    X_new[col].cat.add_categories(self.new_cat, inplace=True)
-                except ValueError as e:
-                    raise ValueError(
-                        'You need to specify different "new_cat" value, '
-                        'because the current one is already included in the '
-                        'category names.'
-                    ).with_traceback(e.__traceback__)
-                cat_removals = list(
-                    set(self.imp_cats_[col]).intersection(
-                        X_new[col].cat.categories
-                    )
-                )
-                X_new[col].cat.remove_categories(
-                    cat_removals,
-                    inplace=True
+            if col in grouped:
+                X_new[col] = grouped[col]
+            else:
+                X_new[col] = self._group_sparse_cats(
+                    X[col], self.imp_cats_[col]
                 )
-            X_new.loc[row_indices, col] = self.new_cat
 
         return X_new
 
+    def _group_sparse_cats(self, series, sparse_cats):
+        """Returns the series with sparse categories replaced by new_cat."""
+        if series.dtype.name == 'category':
+            cat = series.values
+            remap, new_categories = self._remap_categories(
+                cat.categories, sparse_cats
+            )
+            if remap is None:
+                if self.new_cat in cat.categories:
+                    return series
+                return series.cat.add_categories(self.new_cat)
+            # Trailing -1 keeps missing values (code -1) missing.
+            remap = np.append(remap, -1)
+            return pd.Series(
+                pd.Categorical.from_codes(
+                    remap[cat.codes],
+                    categories=new_categories,
+                    ordered=cat.ordered
+                ),
+                index=series.index,
+                name=series.name
+            )
+
+        if not len(sparse_cats):
+            return series
+
+        return series.mask(series.isin(sparse_cats), self.new_cat)
+
+    def _group_sparse_codes(self, X):
+        """Groups sparse categories of all category dtype columns at once."""
+        if isinstance(_has_numba, ImportError):
+            raise ImportError(
+                "`CategoricalGrouper` with `use_numba=True` requires extra "
+                "requirements installed. Reinstall paralytics package with "
+                "'numba' extra specified or install the dependencies "
+                "directly from the source."
+            ).with_traceback(_has_numba.__traceback__)
+
+        grouped = {}
+        cols, remaps, categories = [], [], []
+        for col in self.cat_cols_:
+            if X[col].dtype.name != 'category':
+                continue
+            remap, new_categories = self._remap_categories(
+                X[col].cat.categories, self.imp_cats_[col]
+            )
+            if remap is None:
+                if self.new_cat in X[col].cat.categories:
+                    grouped[col] = X[col]
+                else:
+                    grouped[col] = X[col].cat.add_categories(self.new_cat)
+                continue
+            cols.append(col)
+            remaps.append(remap)
+            categories.append(new_categories)
+
+        if not cols:
+            return grouped
+
+        remap_table = np.zeros(
+            (len(cols), max(len(remap) for remap in remaps)), dtype=np.int32
+        )
+        for j, remap in enumerate(remaps):
+            remap_table[j, :len(remap)] = remap
+        codes = np.empty((len(cols), len(X)), dtype=np.int32)
+        for j, col in enumerate(cols):
+            codes[j] = X[col].cat.codes.values
+        _remap_codes(codes, remap_table)
+
+        for j, col in enumerate(cols):
+            grouped[col] = pd.Series(
+                pd.Categorical.from_codes(
+                    codes[j],
+                    categories=categories[j],
+                    ordered=X[col].cat.ordered
+                ),
+                index=X.index,
+                name=col
+            )
+
+        return grouped
+
+    def _remap_categories(self, categories, sparse_cats):
+        """Returns codes mapping and categories after grouping sparse ones.
+
+        The codes mapping is None when none of the categories is sparse.
+
+        """
+        sparse_mask = categories.isin(sparse_cats)
+        if self.new_cat in categories:
+            sparse_mask &= categories != self.new_cat
+            if not sparse_mask.any():
+                return None, categories
+            new_categories = categories[~sparse_mask]
+            new_code = new_categories.get_loc(self.new_cat)
+        else:
+            if not sparse_mask.any():
+                return None, categories.append(pd.Index([self.new_cat]))
+            new_categories = categories[~sparse_mask].append(
+                pd.Index([self.new_cat])
+            )
+            new_code = len(new_categories) - 1
+        remap = np.where(sparse_mask, new_code, np.cumsum(~sparse_mask) - 1)
+
+        return remap, new_categories
+
     @staticmethod
     def _cat_cols_selection(X, include, exclude):
         """Returns categorical columns including the user's corrections."""
-        cat_cols = X.select_dtypes('category').columns.tolist()
-
         if include is not None:
             assert isinstance(include, list), \
                 'Columns to include must be given as an instance of a list!'
-            cat_cols = [
-                col for col in X.columns
-                if col in cat_cols or col in include
-            ]
+            include = set(include)
+        else:
+            include = set()
+
+        cat_cols = [
+            col for col, dtype in X.dtypes.items()
+            if isinstance(dtype, CategoricalDtype) or col in include
+        ]
 
         if exclude is not None:
             assert isinstance(exclude, list), \
                 'Columns to exclude must be given as an instance of a list!'
+            exclude = set(exclude)
             cat_cols = [col for col in cat_cols if col not in exclude]
 
         return cat_cols
@@ -325,19 +459,18 @@ class ColumnProjector(BaseEstimator, TransformerMixin):
             Returns the instance itself.
 
         """
-        self.automatic_projection_ = {'category': [], bool: []}
+        num_type = float if self.num_to_float else int
+        self.automatic_projection_ = {'category': [], bool: [], num_type: []}
 
-        if self.num_to_float:
-            self.automatic_projection_[float] = []
-        else:
-            self.automatic_projection_[int] = []
-
-        for col in X.columns:
-            if self.num_to_float and is_numeric(X[col]):
-                self.automatic_projection_[float].append(col)
+        for col, dtype in X.dtypes.items():
+            if is_numeric_dtype(dtype):
+                if _is_bool_like(X[col]):
+                    self.automatic_projection_[bool].append(col)
+                else:
+                    self.automatic_projection_[num_type].append(col)
             elif is_numeric(X[col]):
-                self.automatic_projection_[int].append(col)
-            elif set(X[col]) <= {0, 1}:
+                self.automatic_projection_[num_type].append(col)
+            elif _is_bool_like(X[col]):
                 self.automatic_projection_[bool].append(col)
             else:
                 self.automatic_projection_['category'].append(col)
@@ -368,21 +501,23 @@ class ColumnProjector(BaseEstimator, TransformerMixin):
         assert isinstance(X, pd.DataFrame), \
             'Input must be an instance of pandas.DataFrame()'
 
-        X_new, columns_projected = self._project(X, self.manual_projection)
-        X_new, _ = self._project(
-            X_new, self.automatic_projection_, skip_columns=columns_projected
+        manual_cols = self._project(X, self.manual_projection)
+        automatic_cols = self._project(
+            X, self.automatic_projection_, skip_columns=manual_cols
         )
+        projected_cols = {**automatic_cols, **manual_cols}
+        X_new = X.copy(deep=False)
+        for col, values in projected_cols.items():
+            X_new[col] = values
 
         return X_new
 
     @staticmethod
     def _project(X, projection_dict, skip_columns=None):
-        """Projects X in accordance with the guidelines provided."""
-        X_new = X.copy()
-        columns_projected = []
+        """Returns X columns cast in line with the guidelines provided."""
+        out_cols = {}
 
-        if skip_columns is None:
-            skip_columns = []
+        skip_columns = set() if skip_columns is None else set(skip_columns)
 
         if projection_dict is not None:
             assert isinstance(projection_dict, dict), \
@@ -396,19 +531,19 @@ class ColumnProjector(BaseEstimator, TransformerMixin):
                     col for col in col_names if col not in skip_columns
                 ]
                 if cols_to_project:
-                    try:
-                        X_new[cols_to_project] = (
-                            X_new[cols_to_project].astype(col_type)
-                        )
-                    except KeyError:
-                        cols_error = list(
-                            set(cols_to_project) - set(X_new.columns)
-                        )
+                    cols_error = (
+                        pd.Index(cols_to_project).difference(X.columns)
+                        .tolist()
+                    )
+                    if cols_error:
                         raise KeyError("C'mon, those columns ain't in "
                                        "the DataFrame: %s" % cols_error)
-                    columns_projected.extend(cols_to_project)
+                    cast_block = X[cols_to_project].astype(col_type)
+                    out_cols.update(
+                        {col: cast_block[col] for col in cols_to_project}
+                    )
 
-        return X_new, columns_projected
+        return out_cols
 
 
 class ColumnSelector(BaseEstimator, TransformerMixin):
@@ -464,14 +599,17 @@ class ColumnSelector(BaseEstimator, TransformerMixin):
         assert isinstance(X, pd.DataFrame), \
             'Input must be an instance of pandas.DataFrame!'
 
-        try:
-            X_new = X[self.columns]
-            return X_new
-        except KeyError as e:
-            cols_error = list(set(self.columns) - set(X.columns))
+        columns = (
+            self.columns if is_list_like(self.columns) else [self.columns]
+        )
+        cols_error = pd.Index(columns).difference(X.columns).tolist()
+        if cols_error:
             raise KeyError(
                 "Selected columns not found in the DataFrame: %s" % cols_error
-            ).with_traceback(e.__traceback__)
+            )
+        X_new = X.loc[:, self.columns]
+
+        return X_new
 
 
 class TypeSelector(BaseEstimator, TransformerMixin):
@@ -529,3 +667,21 @@ class TypeSelector(BaseEstimator, TransformerMixin):
         X_new = X.select_dtypes(include=[self.col_type])
 
         return X_new
+
+
+if _has_numba is True:
+    @njit(parallel=True, cache=True)
+    def _remap_codes(codes, remap_table):
+        """Maps in place each row of codes through its row of remap_table."""
+        for j in prange(codes.shape[0]):
+            for i in range(codes.shape[1]):
+                if codes[j, i] >= 0:
+                    codes[j, i] = remap_table[j, codes[j, i]]
+
+
+def _is_bool_like(X):
+    """Checks whether given vector contains 0 and 1 values only."""
+    values = X.values
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'biuf':
+        return not ((values != 0) & (values != 1)).any()
+    return set(values) <= {0, 1}
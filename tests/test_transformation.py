@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas.testing import assert_frame_equal
+
+from paralytics.preprocessing import CategoricalGrouper
+
+
+def test_categorical_grouper_numba_matches_pandas():
+    pytest.importorskip('numba')
+
+    rng = np.random.RandomState(42)
+    n = 500
+    ordered = pd.Categorical(
+        rng.choice(list('abcdefg'), n, p=[.5, .3, .1, .05, .02, .02, .01]),
+        categories=list('gfedcba'), ordered=True
+    )
+    ordered[rng.rand(n) < .05] = np.nan
+    with_new_cat = pd.Categorical(
+        rng.choice(['x', 'y', 'Other', 'z', 'w'], n,
+                   p=[.6, .3, .05, .03, .02])
+    )
+    X = pd.DataFrame({
+        'ordered': ordered,
+        'with_new_cat': with_new_cat,
+        'dense': pd.Categorical(rng.choice(['p', 'q'], n)),
+        'obj': pd.Series(rng.choice(list('klmn'), n, p=[.7, .2, .06, .04]),
+                         dtype=object),
+        'num': rng.rand(n)
+    })
+
+    grouper = CategoricalGrouper(percentile_thresh=.1, include_cols=['obj'])
+    expected = grouper.fit(X).transform(X)
+    result = grouper.set_params(use_numba=True).transform(X)
+
+    assert_frame_equal(result, expected)